@@ -1,12 +1,15 @@
 from flask import Flask, request, render_template_string, redirect, flash
 import pandas as pd
-import random
-import datetime
+import json
 from models import Room, Course, TimeSlot
 from generator import TimetableGenerator
+from calendar_config import CalendarConfig
 
 app = Flask(__name__)
 app.secret_key = "secret_key_for_demo"
+GENERATION_BUDGET_MS = 2000
+DEFAULT_SEED = 42
+DEFAULT_GENERATOR = TimetableGenerator()
 
 @app.route("/", methods=["GET", "POST"])
 def index():
@@ -16,6 +19,11 @@ def index():
             return redirect(request.url)
         file = request.files["csv_file"]
         semester = request.form.get("semester", "")
+        try:
+            seed = int(request.form.get("seed") or DEFAULT_SEED)
+        except ValueError:
+            flash("Seed must be an integer.")
+            return redirect(request.url)
         if file.filename == "":
             flash("No selected file.")
             return redirect(request.url)
@@ -25,6 +33,24 @@ def index():
         except Exception as e:
             flash(f"Error reading CSV: {e}")
             return redirect(request.url)
+        calendar = None
+        calendar_file = request.files.get("calendar_file")
+        if calendar_file and calendar_file.filename:
+            try:
+                calendar = CalendarConfig.from_dict(json.load(calendar_file))
+            except Exception as e:
+                flash(f"Error reading calendar: {e}")
+                return redirect(request.url)
+        generator = TimetableGenerator(calendar) if calendar else DEFAULT_GENERATOR
+        hint = None
+        hint_file = request.files.get("hint_file")
+        if hint_file and hint_file.filename:
+            try:
+                hint = json.load(hint_file)
+                generator.index_hint(hint)
+            except Exception as e:
+                flash(f"Error reading previous timetable: {e}")
+                return redirect(request.url)
 
         rooms = []
         for classroom in df["Classroom"].unique():
@@ -45,9 +71,9 @@ def index():
             except (ValueError, TypeError) as e:
                 print(f"Error parsing L, T, P for {row['Course Code']}: {e}")
                 continue
-            num_lectures = int(L / 1.5)
-            num_tutorials = T
-            num_labs = P // 2
+            num_lectures = generator.calendar.sessions_per_week("Lecture", L)
+            num_tutorials = generator.calendar.sessions_per_week("Tutorial", T)
+            num_labs = generator.calendar.sessions_per_week("Lab", P)
             course = Course(
                 course_id=row["Course Code"],
                 course_name=row["Course Name"],
@@ -62,30 +88,28 @@ def index():
             course_info[course.course_id] = {"faculty": course.professor_id,
                                                "classroom": course.fixed_classroom or "Not Assigned"}
 
-        generator = TimetableGenerator()
-        timetable = generator.generate_timetable(courses, rooms)
-        generator.validate_timetable(timetable, courses, rooms)
+        timetable = generator.generate_timetable(courses, rooms, time_budget_ms=GENERATION_BUDGET_MS, hint=hint, seed=seed)
+        generator.validate_timetable(timetable, courses, rooms, seed=seed)
+        unplaced = [f"{course.course_id} ({session_type})" for course, session_type in timetable.unplaced]
 
-        base_slots = [f"{h:02d}:{m:02d}-{h + (m + 30) // 60:02d}:{(m + 30) % 60:02d}" for h in range(9, 17) for m in [0, 30]]
+        template = generator.template
+        base_slots = template.tick_labels
         slot_count = len(base_slots)
+        break_names = [break_name for break_name, _, _ in generator.fixed_break_slots]
+        if generator.optional_snack_slot:
+            break_names.append(generator.optional_snack_slot[0])
         timetable_grid = {day: ["" for _ in range(slot_count)] for day in generator.working_days}
         for day in generator.working_days:
-            for i in range(slot_count):
-                start_str, end_str = base_slots[i].split("-")
-                start_time = datetime.datetime.strptime(start_str, "%H:%M").time()
-                end_time = datetime.datetime.strptime(end_str, "%H:%M").time()
+            for i, (start_time, end_time) in enumerate(template.ticks):
                 slot = TimeSlot(day, start_time, end_time)
                 for session in timetable.sessions:
                     if session.time_slot.day == day and session.time_slot.overlaps(slot):
                         suffix = {"Lecture": "L", "Tutorial": "T", "Lab": "P"}.get(session.session_type, "")
                         timetable_grid[day][i] = f"{session.course.course_id} ({suffix})"
-                for break_name, break_start, break_end in generator.fixed_break_slots:
-                    break_slot = TimeSlot(day, break_start, break_end)
-                    if slot.overlaps(break_slot):
-                        timetable_grid[day][i] = break_name
-                snack_slot = TimeSlot(day, generator.optional_snack_slot[1], generator.optional_snack_slot[2])
-                if slot.overlaps(snack_slot) and any(s.session_type == "Snacks" and s.time_slot.day == day for s in timetable.sessions):
-                    timetable_grid[day][i] = "Snacks"
+                if template.tick_breaks[i]:
+                    timetable_grid[day][i] = template.tick_breaks[i]
+                if i in template.snack_ticks and any(s.session_type == "Snacks" and s.time_slot.day == day for s in timetable.sessions):
+                    timetable_grid[day][i] = generator.optional_snack_slot[0]
 
         distinct_colors = ["#FF6347", "#4682B4", "#32CD32", "#FFD700", "#6A5ACD",
                            "#FF69B4", "#00CED1", "#FFA500", "#20B2AA", "#DAA520"]
@@ -190,6 +214,14 @@ def index():
                     font-weight: 500;
                 }
 
+                .warning {
+                    background-color: #FFF4E5;
+                    color: #B26A00;
+                    padding: 1rem 1.5rem;
+                    border-radius: 8px;
+                    margin-bottom: 2rem;
+                }
+
                 .legend {
                     background-color: white;
                     padding: 1.5rem;
@@ -265,10 +297,22 @@ def index():
                         <h3>{{ semester_text }} (Dec 2024 - Apr 2025)</h3>
                         <p>Section A - Roll No 23BCS001 to 23BCS070</p>
                     </div>
-                    <button class="export-btn" onclick="exportToExcel()">
-                        Export to Excel
-                    </button>
+                    <div>
+                        <button class="export-btn" onclick="exportToExcel()">
+                            Export to Excel
+                        </button>
+                        <button class="export-btn" onclick="exportToJson()">
+                            Export JSON
+                        </button>
+                    </div>
+                </div>
+
+                {% if unplaced %}
+                <div class="warning">
+                    <strong>Could not schedule {{ unplaced|length }} session(s):</strong>
+                    {{ unplaced|join(", ") }}
                 </div>
+                {% endif %}
 
                 <div class="timetable-container">
                     <table id="timetable">
@@ -283,8 +327,8 @@ def index():
                             <td><strong>{{ day }}</strong></td>
                             {% for i in range(slot_count) %}
                                 {% set cell_content = timetable_grid[day][i] %}
-                                {% if cell_content in ["Morning Break", "Lunch", "Snacks"] %}
-                                    {% set class_name = "break" if cell_content in ["Morning Break", "Snacks"] else "lunch" %}
+                                {% if cell_content in break_names %}
+                                    {% set class_name = "lunch" if cell_content == "Lunch" else "break" %}
                                     <td class="{{ class_name }}">{{ cell_content }}</td>
                                 {% else %}
                                     {% set color = course_colors.get(cell_content.split(' ')[0], "#FFFFFF") %}
@@ -317,6 +361,16 @@ def index():
                 function exportToExcel() {
                     // ... existing export code ...
                 }
+
+                function exportToJson() {
+                    const records = {{ timetable_records|tojson }};
+                    const blob = new Blob([JSON.stringify(records, null, 2)], {type: "application/json"});
+                    const link = document.createElement("a");
+                    link.href = URL.createObjectURL(blob);
+                    link.download = "timetable.json";
+                    link.click();
+                    URL.revokeObjectURL(link.href);
+                }
             </script>
         </body>
         </html>
@@ -326,6 +380,9 @@ def index():
                                       base_slots=base_slots,
                                       working_days=generator.working_days,
                                       slot_count=slot_count,
+                                      break_names=break_names,
+                                      unplaced=unplaced,
+                                      timetable_records=timetable.to_records(),
                                       timetable_grid=timetable_grid,
                                       course_codes=course_codes,
                                       course_colors=course_colors,
@@ -459,12 +516,23 @@ def index():
                     <option value="VII">Semester VII</option>
                     <option value="VIII">Semester VIII</option>
                 </select>
+                <input type="number" name="seed" class="semester-select" placeholder="Random seed (default 42)">
                 <div class="file-input-container" onclick="document.getElementById('csv_file').click()">
                     <p>Click to upload your CSV file</p>
                     <button type="button" class="select-file-btn">Select File</button>
                     <div id="selected-file" class="selected-file"></div>
                 </div>
                 <input type="file" name="csv_file" id="csv_file" accept=".csv" required>
+                <div class="file-input-container" onclick="document.getElementById('calendar_file').click()">
+                    <p>Optional: upload a calendar JSON (days, hours, breaks, durations)</p>
+                    <button type="button" class="select-file-btn">Select Calendar</button>
+                </div>
+                <input type="file" name="calendar_file" id="calendar_file" accept=".json">
+                <div class="file-input-container" onclick="document.getElementById('hint_file').click()">
+                    <p>Optional: upload last term's timetable JSON to start from</p>
+                    <button type="button" class="select-file-btn">Select Previous Timetable</button>
+                </div>
+                <input type="file" name="hint_file" id="hint_file" accept=".json">
                 <button type="submit" class="submit-btn">Generate Timetable</button>
             </form>
         </div>
@@ -485,5 +553,4 @@ def index():
     """)
     
 if __name__ == "__main__":
-    random.seed(42)
     app.run(debug=True, port=5002)
@@ -0,0 +1,143 @@
+import datetime
+import functools
+import json
+from typing import Dict, List, Tuple
+from models import TimeSlot
+
+DEFAULT_CALENDAR = {
+    "working_days": ["MON", "TUE", "WED", "THU", "FRI"],
+    "working_hours": {"start": "09:00", "end": "17:00"},
+    "breaks": [
+        {"name": "Morning Break", "start": "10:30", "end": "11:00"},
+        {"name": "Lunch", "start": "13:30", "end": "14:30"}
+    ],
+    "snack_slot": {"name": "Snacks", "start": "16:30", "end": "17:00"},
+    "durations_minutes": {"Lecture": 90, "Lab": 120, "Tutorial": 60},
+    "step_minutes": 30
+}
+
+SESSION_TYPES = ("Lecture", "Lab", "Tutorial")
+TEMPLATE_CACHE_SIZE = 32
+
+def parse_time(value) -> datetime.time:
+    if isinstance(value, datetime.time):
+        return value
+    return datetime.datetime.strptime(value, "%H:%M").time()
+
+def add_minutes(value: datetime.time, minutes: int) -> datetime.time:
+    return (datetime.datetime.combine(datetime.date.today(), value) + datetime.timedelta(minutes=minutes)).time()
+
+class CalendarConfig:
+    def __init__(self, working_days: List[str], working_hours: Tuple[datetime.time, datetime.time],
+                 breaks: List[Tuple[str, datetime.time, datetime.time]], snack_slot: Tuple[str, datetime.time, datetime.time],
+                 durations_minutes: Dict[str, int], step_minutes: int):
+        if not working_days:
+            raise ValueError("Calendar needs at least one working day.")
+        if working_hours[0] >= working_hours[1]:
+            raise ValueError("Working hours must end after they start.")
+        if step_minutes <= 0 or any(minutes <= 0 for minutes in durations_minutes.values()):
+            raise ValueError("Step and session durations must be positive.")
+        missing = [session_type for session_type in SESSION_TYPES if session_type not in durations_minutes]
+        if missing:
+            raise ValueError(f"Calendar is missing durations for: {', '.join(missing)}.")
+        for name, start, end in list(breaks) + ([snack_slot] if snack_slot else []):
+            if not working_hours[0] <= start < end <= working_hours[1]:
+                raise ValueError(f"{name} must start before it ends and fall within working hours.")
+        self.working_days = tuple(working_days)
+        self.working_hours = tuple(working_hours)
+        self.breaks = tuple(tuple(b) for b in breaks)
+        self.snack_slot = tuple(snack_slot) if snack_slot else None
+        self.durations_minutes = dict(durations_minutes)
+        self.step_minutes = step_minutes
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CalendarConfig":
+        merged = {**DEFAULT_CALENDAR, **data}
+        for field in ("working_hours", "durations_minutes", "snack_slot"):
+            if isinstance(data.get(field), dict):
+                merged[field] = {**DEFAULT_CALENDAR[field], **data[field]}
+        for entry in merged["breaks"]:
+            missing = [key for key in ("name", "start", "end") if key not in entry]
+            if missing:
+                raise ValueError(f"Break is missing: {', '.join(missing)}.")
+        snack = merged["snack_slot"]
+        return cls(
+            working_days=merged["working_days"],
+            working_hours=(parse_time(merged["working_hours"]["start"]), parse_time(merged["working_hours"]["end"])),
+            breaks=[(b["name"], parse_time(b["start"]), parse_time(b["end"])) for b in merged["breaks"]],
+            snack_slot=(snack["name"], parse_time(snack["start"]), parse_time(snack["end"])) if snack else None,
+            durations_minutes={t: int(m) for t, m in merged["durations_minutes"].items()},
+            step_minutes=int(merged["step_minutes"])
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "CalendarConfig":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def default(cls) -> "CalendarConfig":
+        return cls.from_dict({})
+
+    def sessions_per_week(self, session_type: str, weekly_hours: float) -> int:
+        return round(weekly_hours * 60 / self.durations_minutes[session_type])
+
+    def key(self) -> tuple:
+        return (self.working_days, self.working_hours, self.breaks, self.snack_slot,
+                tuple(self.durations_minutes.items()), self.step_minutes)
+
+    def compile(self) -> "SlotTemplate":
+        return compile_template(self.key())
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(key: tuple) -> "SlotTemplate":
+    working_days, working_hours, breaks, snack_slot, durations, step_minutes = key
+    return SlotTemplate(CalendarConfig(working_days, working_hours, breaks, snack_slot, dict(durations), step_minutes))
+
+class SlotTemplate:
+    def __init__(self, config: CalendarConfig):
+        self.config = config
+        self.day_index = {day: i for i, day in enumerate(config.working_days)}
+        self.ticks = self.build_ticks(config)
+        self.tick_labels = tuple(f"{start.strftime('%H:%M')}-{end.strftime('%H:%M')}" for start, end in self.ticks)
+        self.tick_breaks = tuple(self.break_at(config.breaks, start, end) for start, end in self.ticks)
+        self.snack_ticks = frozenset(i for i, (start, end) in enumerate(self.ticks)
+                                     if config.snack_slot and start < config.snack_slot[2] and end > config.snack_slot[1])
+        self.time_slots = tuple(self.build_time_slots(config))
+
+    @staticmethod
+    def build_ticks(config: CalendarConfig) -> tuple:
+        ticks = []
+        current_time, day_end = config.working_hours
+        while current_time < day_end:
+            next_time = add_minutes(current_time, config.step_minutes)
+            if next_time <= current_time or next_time > day_end:
+                next_time = day_end
+            ticks.append((current_time, next_time))
+            current_time = next_time
+        return tuple(ticks)
+
+    @staticmethod
+    def break_at(breaks: tuple, start: datetime.time, end: datetime.time) -> str:
+        for break_name, break_start, break_end in breaks:
+            if start < break_end and end > break_start:
+                return break_name
+        return ""
+
+    @staticmethod
+    def build_time_slots(config: CalendarConfig) -> List[TimeSlot]:
+        durations = list(dict.fromkeys(config.durations_minutes.values()))
+        day_end = config.working_hours[1]
+        ticks = SlotTemplate.build_ticks(config)
+        time_slots = []
+        for day in config.working_days:
+            for break_name, start, end in config.breaks:
+                time_slots.append(TimeSlot(day, start, end, break_name))
+            for current_time, _ in ticks:
+                for duration in durations:
+                    end_time = add_minutes(current_time, duration)
+                    if end_time <= current_time or end_time > day_end:
+                        continue
+                    if not SlotTemplate.break_at(config.breaks, current_time, end_time):
+                        time_slots.append(TimeSlot(day, current_time, end_time))
+        return time_slots
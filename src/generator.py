@@ -1,52 +1,57 @@
-import datetime
 import random
-import copy
+import math
+import time
 from collections import defaultdict
 from typing import List, Tuple
 from models import TimeSlot, Room, Course, Session, Timetable
+from calendar_config import CalendarConfig, parse_time
 
-class TimetableGenerator:
-    def __init__(self):
-        self.working_days = ["MON", "TUE", "WED", "THU", "FRI"]
-        self.fixed_break_slots = [
-            ("Morning Break", datetime.time(10, 30), datetime.time(11, 0)),
-            ("Lunch", datetime.time(13, 30), datetime.time(14, 30))
-        ]
-        self.optional_snack_slot = ("Snacks", datetime.time(16, 30), datetime.time(17, 0))
-        self.working_hours = {"start": datetime.time(9, 0), "end": datetime.time(17, 0)}
-        self.durations = {"Lecture": 1.5, "Lab": 2.0, "Tutorial": 1.0}
-        self.max_backtrack_attempts = 2000
+HINT_FIELDS = {"course_id", "session_type", "day", "start", "end", "room_id"}
+
+class GenerationRun:
+    def __init__(self, seed: int = None, time_budget_ms: float = None, hint: dict = None):
+        self.rng = random.Random(seed)
         self.backtrack_count = 0
         self.session_ids = defaultdict(lambda: {"Lecture": 0, "Tutorial": 0, "Lab": 0})
+        self.deadline = time.monotonic() + time_budget_ms / 1000 if time_budget_ms is not None else None
+        self.best_sessions = []
+        self.best_score = None
+        self.hint = hint if hint is not None else {}
+
+    def next_session_id(self, course_id: str, session_type: str) -> int:
+        session_id = self.session_ids[course_id][session_type]
+        self.session_ids[course_id][session_type] += 1
+        return session_id
+
+    def deadline_passed(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def record_best(self, timetable: Timetable) -> None:
+        score = (-len(timetable.sessions), timetable.penalty())
+        if self.best_score is None or score < self.best_score:
+            self.best_score = score
+            self.best_sessions = list(timetable.sessions)
+
+class TimetableGenerator:
+    def __init__(self, calendar: CalendarConfig = None, max_backtrack_attempts: int = 2000):
+        self.calendar = calendar or CalendarConfig.default()
+        self.template = self.calendar.compile()
+        self.working_days = self.calendar.working_days
+        self.fixed_break_slots = self.calendar.breaks
+        self.optional_snack_slot = self.calendar.snack_slot
+        self.working_hours = {"start": self.calendar.working_hours[0], "end": self.calendar.working_hours[1]}
+        self.durations = {session_type: minutes / 60 for session_type, minutes in self.calendar.durations_minutes.items()}
+        self.max_backtrack_attempts = max_backtrack_attempts
+        self.slots_by_type = {session_type: frozenset(slot for slot in self.template.time_slots
+                                                      if slot.slot_type == "Regular" and abs(slot.duration_hours() - duration) < 0.01)
+                              for session_type, duration in self.durations.items()}
 
     def generate_time_slots(self) -> List[TimeSlot]:
-        time_slots = []
-        for day in self.working_days:
-            for break_name, start, end in self.fixed_break_slots:
-                time_slots.append(TimeSlot(day, start, end, break_name))
-            current_time = self.working_hours["start"]
-            while current_time < self.working_hours["end"]:
-                for session_type, duration in self.durations.items():
-                    duration_delta = datetime.timedelta(hours=duration)
-                    end_time_dt = datetime.datetime.combine(datetime.date.today(), current_time) + duration_delta
-                    end_time = end_time_dt.time()
-                    if end_time <= self.working_hours["end"]:
-                        slot = TimeSlot(day, current_time, end_time)
-                        valid = True
-                        for _, break_start, break_end in self.fixed_break_slots:
-                            break_slot = TimeSlot(day, break_start, break_end)
-                            if slot.overlaps(break_slot):
-                                valid = False
-                                break
-                        if valid:
-                            time_slots.append(slot)
-                current_dt = datetime.datetime.combine(datetime.date.today(), current_time) + datetime.timedelta(minutes=30)
-                current_time = current_dt.time()
-        return time_slots
+        return list(self.template.time_slots)
 
     def filter_time_slots(self, time_slots: List[TimeSlot], session_type: str) -> List[TimeSlot]:
-        duration = self.durations[session_type]
-        return [slot for slot in time_slots if slot.slot_type == "Regular" and abs(slot.duration_hours() - duration) < 0.01]
+        allowed = self.slots_by_type[session_type]
+        return [slot for slot in time_slots if slot in allowed]
 
     def select_best_room(self, course: Course, session_type: str, available_rooms: List[Room]) -> Room:
         if not available_rooms:
@@ -93,18 +98,61 @@ class TimetableGenerator:
     def get_available_rooms(self, rooms: List[Room], course: Course, session_type: str, time_slot: TimeSlot, timetable: Timetable) -> List[Room]:
         available = []
         for room in rooms:
-            if not timetable.is_room_available(room, time_slot):
-                continue
             if session_type == "Lab" and room.room_type != "LabRoom":
                 continue
             if course.fixed_classroom and session_type != "Lab" and room.room_id != course.fixed_classroom:
                 continue
+            if not timetable.is_room_available(room, time_slot):
+                continue
             available.append(room)
         return available
 
-    def assign_session(self, course: Course, session_type: str, available_time_slots: List[TimeSlot], rooms: List[Room], timetable: Timetable) -> bool:
+    def slot_position(self, time_slot: TimeSlot) -> Tuple:
+        return (self.template.day_index[time_slot.day], time_slot.start_time)
+
+    def placed_positions(self, course: Course, session_type: str, timetable: Timetable) -> List[Tuple]:
+        return [self.slot_position(session.time_slot)
+                for sessions in timetable.course_day_sessions.get(course.course_id, {}).values()
+                for session in sessions if session.session_type == session_type]
+
+    def hint_key(self, time_slot: TimeSlot) -> Tuple:
+        return (time_slot.day, time_slot.start_time, time_slot.end_time)
+
+    def index_hint(self, hint) -> dict:
+        records = hint.to_records() if isinstance(hint, Timetable) else hint or []
+        if not isinstance(records, list):
+            raise ValueError("Hint must be a list of session records.")
+        index = defaultdict(dict)
+        for record in records:
+            if not isinstance(record, dict) or not HINT_FIELDS <= record.keys():
+                raise ValueError(f"Hint records need the fields: {', '.join(sorted(HINT_FIELDS))}.")
+            key = (record["day"], parse_time(record["start"]), parse_time(record["end"]))
+            index[(record["course_id"], record["session_type"])][key] = record["room_id"]
+        return index
+
+    def ordered_slots(self, course: Course, session_type: str, slots: List[TimeSlot], timetable: Timetable) -> List[TimeSlot]:
+        last_position = max(self.placed_positions(course, session_type, timetable), default=None)
+        if last_position is None:
+            return slots
+        return [slot for slot in slots if self.slot_position(slot) > last_position]
+
+    def spread_first(self, course: Course, session_type: str, slots: List[TimeSlot], timetable: Timetable) -> List[TimeSlot]:
+        placed = len(self.placed_positions(course, session_type, timetable))
+        total = {"Lecture": course.num_lectures, "Lab": course.num_labs, "Tutorial": course.num_tutorials}[session_type]
+        last_day = math.ceil((placed + 1) * len(self.working_days) / max(total, 1)) - 1
+        in_window = [slot for slot in slots if self.template.day_index[slot.day] <= last_day]
+        later = sorted((slot for slot in slots if self.template.day_index[slot.day] > last_day), key=self.slot_position)
+        return in_window + later
+
+    def assign_session(self, run: GenerationRun, course: Course, session_type: str, available_time_slots: List[TimeSlot], rooms: List[Room], timetable: Timetable, ordered: bool = True) -> bool:
         valid_slots = self.filter_time_slots(available_time_slots, session_type)
-        random.shuffle(valid_slots)
+        hinted = run.hint.get((course.course_id, session_type), {})
+        run.rng.shuffle(valid_slots)
+        if ordered:
+            valid_slots = self.spread_first(course, session_type, self.ordered_slots(course, session_type, valid_slots, timetable), timetable)
+        if hinted:
+            preferred = sorted((slot for slot in valid_slots if self.hint_key(slot) in hinted), key=self.slot_position)
+            valid_slots = preferred + [slot for slot in valid_slots if self.hint_key(slot) not in hinted]
         for time_slot in valid_slots:
             if not timetable.is_professor_available(course.professor_id, time_slot):
                 continue
@@ -114,53 +162,81 @@ class TimetableGenerator:
                 next_day = self.working_days[day_idx + 1] if day_idx < len(self.working_days) - 1 else None
                 if (prev_day and course.course_id in timetable.lab_days[prev_day]) or (next_day and course.course_id in timetable.lab_days[next_day]):
                     continue
-            available = self.get_available_rooms(rooms, course, session_type, time_slot, timetable)
+            hinted_room = [room for room in rooms if room.room_id == hinted.get(self.hint_key(time_slot))]
+            available = self.get_available_rooms(hinted_room, course, session_type, time_slot, timetable)
+            if not available:
+                available = self.get_available_rooms(rooms, course, session_type, time_slot, timetable)
             if not available:
                 continue
             best_room = self.select_best_room(course, session_type, available)
             if best_room:
-                session_id = self.session_ids[course.course_id][session_type]
+                session_id = run.next_session_id(course.course_id, session_type)
                 session = Session(course, session_type, best_room, time_slot, session_id)
                 timetable.add_session(session)
-                self.session_ids[course.course_id][session_type] += 1
                 available_time_slots.remove(time_slot)
                 print(f"Scheduled {session_type} [ID:{session_id}] for {course.course_id} on {time_slot}")
                 return True
         print(f"Failed to schedule {session_type} for {course.course_id}")
         return False
 
-    def generate_timetable(self, courses: List[Course], rooms: List[Room]) -> Timetable:
+    def generate_timetable(self, courses: List[Course], rooms: List[Room], time_budget_ms: float = None, hint=None, seed: int = None) -> Timetable:
+        run = GenerationRun(seed, time_budget_ms, self.index_hint(hint))
+        return self.search(run, courses, rooms)
+
+    def search(self, run: GenerationRun, courses: List[Course], rooms: List[Room]) -> Timetable:
         timetable = Timetable()
         all_time_slots = self.generate_time_slots()
         sorted_courses = sorted(courses, key=lambda c: (-c.num_labs, -c.total_sessions(), -c.total_students))
-        assignment_stack = []
-        for course in sorted_courses:
-            available_time_slots = copy.deepcopy(all_time_slots)
-            for session_type, count in [("Lab", course.num_labs), ("Lecture", course.num_lectures), ("Tutorial", course.num_tutorials)]:
-                for _ in range(count):
-                    if self.assign_session(course, session_type, available_time_slots, rooms, timetable):
-                        assignment_stack.append((course, session_type))
-                    else:
-                        return self.backtrack(timetable, courses, rooms, assignment_stack)
+        plan = [(course, session_type) for course in sorted_courses
+                for session_type, count in [("Lab", course.num_labs), ("Lecture", course.num_lectures), ("Tutorial", course.num_tutorials)]
+                for _ in range(count)]
+        tried = defaultdict(set)
+        while len(timetable.sessions) < len(plan):
+            if run.deadline_passed():
+                print("Warning: Time budget exhausted, returning best timetable found.")
+                return self.best_timetable(run, courses)
+            depth = len(timetable.sessions)
+            course, session_type = plan[depth]
+            candidates = [slot for slot in all_time_slots if slot not in tried[depth]]
+            if self.assign_session(run, course, session_type, candidates, rooms, timetable):
+                tried[depth].add(timetable.sessions[-1].time_slot)
+                tried.pop(depth + 1, None)
+                run.record_best(timetable)
+                continue
+            tried.pop(depth, None)
+            run.backtrack_count += 1
+            if run.backtrack_count > self.max_backtrack_attempts:
+                print(f"Warning: Maximum backtracking attempts ({self.max_backtrack_attempts}) reached.")
+                return self.best_timetable(run, courses)
+            session = timetable.remove_last_session()
+            if session is None:
+                print("Error: No more assignments to backtrack.")
+                return self.best_timetable(run, courses)
+            run.hint.pop((session.course.course_id, session.session_type), None)
         return timetable
 
-    def backtrack(self, timetable: Timetable, courses: List[Course], rooms: List[Room], assignment_stack: List[Tuple]) -> Timetable:
-        self.backtrack_count += 1
-        if self.backtrack_count > self.max_backtrack_attempts:
-            print(f"Warning: Maximum backtracking attempts ({self.max_backtrack_attempts}) reached.")
-            return timetable
-        session = timetable.remove_last_session()
-        if not assignment_stack:
-            print("Error: No more assignments to backtrack.")
-            return timetable
-        last_course, last_session_type = assignment_stack.pop()
-        all_time_slots = self.generate_time_slots()
-        if self.assign_session(last_course, last_session_type, all_time_slots, rooms, timetable):
-            assignment_stack.append((last_course, last_session_type))
-            return self.generate_timetable(courses, rooms)
-        return self.backtrack(timetable, courses, rooms, assignment_stack)
+    def unplaced_sessions(self, timetable: Timetable, courses: List[Course]) -> List[Tuple]:
+        placed = defaultdict(int)
+        for session in timetable.sessions:
+            placed[(session.course.course_id, session.session_type)] += 1
+        unplaced = []
+        for course in courses:
+            for session_type, count in [("Lab", course.num_labs), ("Lecture", course.num_lectures), ("Tutorial", course.num_tutorials)]:
+                missing = count - placed[(course.course_id, session_type)]
+                unplaced.extend((course, session_type) for _ in range(missing))
+        return unplaced
+
+    def best_timetable(self, run: GenerationRun, courses: List[Course]) -> Timetable:
+        timetable = Timetable()
+        for session in run.best_sessions:
+            timetable.add_session(session)
+        timetable.unplaced = self.unplaced_sessions(timetable, courses)
+        return timetable
 
-    def validate_timetable(self, timetable: Timetable, courses: List[Course], rooms: List[Room]):
+    def validate_timetable(self, timetable: Timetable, courses: List[Course], rooms: List[Room], seed: int = None):
+        run = GenerationRun(seed)
+        for session in timetable.sessions:
+            run.next_session_id(session.course.course_id, session.session_type)
         all_time_slots = self.generate_time_slots()
         for course in courses:
             expected = {
@@ -175,7 +251,8 @@ class TimetableGenerator:
             }
             if assigned != expected:
                 print(f"Validation Failed for {course.course_id}: Expected {expected}, Got {assigned}")
-                avail_slots = copy.deepcopy(all_time_slots)
+                avail_slots = list(all_time_slots)
                 for session_type in ["Lecture", "Tutorial", "Lab"]:
                     for _ in range(expected[session_type] - assigned[session_type]):
-                        self.assign_session(course, session_type, avail_slots, rooms, timetable)
+                        self.assign_session(run, course, session_type, avail_slots, rooms, timetable, ordered=False)
+        timetable.unplaced = self.unplaced_sessions(timetable, courses)
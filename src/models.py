@@ -67,6 +67,7 @@ class Timetable:
         self.room_timeslot_map = {}
         self.professor_timeslot_map = {}
         self.lab_days = defaultdict(set)
+        self.unplaced = []
 
     def add_session(self, session: Session) -> None:
         self.sessions.append(session)
@@ -116,3 +117,11 @@ class Timetable:
 
     def count_sessions_on_day(self, course_id: str, day: str) -> int:
         return len(self.course_day_sessions[course_id].get(day, []))
+
+    def to_records(self) -> list:
+        return [{"course_id": s.course.course_id, "session_type": s.session_type, "day": s.time_slot.day,
+                 "start": s.time_slot.start_time.strftime("%H:%M"), "end": s.time_slot.end_time.strftime("%H:%M"),
+                 "room_id": s.room.room_id} for s in self.sessions]
+
+    def penalty(self) -> int:
+        return sum(max(0, len(sessions) - 1) for days in self.course_day_sessions.values() for sessions in days.values())
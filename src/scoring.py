@@ -0,0 +1,106 @@
+import datetime
+import math
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+from models import Course, Timetable
+
+SESSION_TYPES = ["Lecture", "Tutorial", "Lab"]
+COURSE, TYPE, DAY, START, ROOM, PROFESSOR = range(6)
+DEFAULT_WEIGHTS = {"idle_gap_hours": 1.0, "load_stddev": 1.0, "max_consecutive_hours": 1.0, "lecture_day_repeats": 2.0}
+
+def to_minutes(value: datetime.time, origin: datetime.time) -> int:
+    return (value.hour - origin.hour) * 60 + value.minute - origin.minute
+
+def to_tick(value: datetime.time, origin: datetime.time, step_minutes: int) -> int:
+    return to_minutes(value, origin) // step_minutes
+
+def encode_timetables(timetables: List[Timetable], courses: List[Course], generator) -> Tuple[np.ndarray, Dict[str, Dict[str, int]]]:
+    vocab = {"course": {course.course_id: i for i, course in enumerate(courses)}, "room": {}, "professor": {}}
+    day_index = {day: i for i, day in enumerate(generator.working_days)}
+    origin = generator.working_hours["start"]
+    step_minutes = generator.calendar.step_minutes
+    max_sessions = max((len(timetable.sessions) for timetable in timetables), default=0)
+    encoded = np.full((len(timetables), max_sessions, 6), -1, dtype=np.int32)
+    for n, timetable in enumerate(timetables):
+        for s, session in enumerate(timetable.sessions):
+            encoded[n, s] = (
+                vocab["course"].setdefault(session.course.course_id, len(vocab["course"])),
+                SESSION_TYPES.index(session.session_type),
+                day_index[session.time_slot.day],
+                to_tick(session.time_slot.start_time, origin, step_minutes),
+                vocab["room"].setdefault(session.room.room_id, len(vocab["room"])),
+                vocab["professor"].setdefault(session.course.professor_id, len(vocab["professor"]))
+            )
+    return encoded, vocab
+
+def occupancy(keys: np.ndarray, num_keys: int, covers: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    onehot = (mask[..., None] & (keys[..., None] == np.arange(num_keys))).astype(np.int32)
+    return (onehot.transpose(0, 2, 1) @ covers.astype(np.int32)) > 0
+
+def longest_runs(occupied: np.ndarray) -> np.ndarray:
+    counts = np.cumsum(occupied, axis=-1)
+    resets = np.maximum.accumulate(np.where(occupied, 0, counts), axis=-1)
+    return (counts - resets).max(axis=-1, initial=0)
+
+def count_unplaced(encoded: np.ndarray, courses: List[Course], num_courses: int) -> np.ndarray:
+    expected = np.zeros((num_courses, len(SESSION_TYPES)), dtype=np.int32)
+    for i, course in enumerate(courses):
+        expected[i] = (course.num_lectures, course.num_tutorials, course.num_labs)
+    valid = encoded[..., COURSE] >= 0
+    keys = encoded[..., COURSE] * len(SESSION_TYPES) + encoded[..., TYPE]
+    placed = (valid[..., None] & (keys[..., None] == np.arange(expected.size))).sum(axis=1)
+    return np.maximum(expected.reshape(-1) - placed, 0).sum(axis=-1)
+
+def score_encoded(encoded: np.ndarray, vocab: Dict[str, Dict[str, int]], generator) -> Dict[str, np.ndarray]:
+    num_days = len(generator.working_days)
+    step_minutes = generator.calendar.step_minutes
+    num_ticks = len(generator.template.ticks)
+    hours_per_tick = step_minutes / 60
+    ticks = np.arange(num_ticks)
+
+    break_mask = np.array([bool(name) for name in generator.template.tick_breaks], dtype=bool)
+    duration_ticks = np.array([math.ceil(generator.calendar.durations_minutes[t] / step_minutes) for t in SESSION_TYPES], dtype=np.int32)
+
+    valid = encoded[..., COURSE] >= 0
+    day = encoded[..., DAY]
+    start = encoded[..., START]
+    end = start + duration_ticks[np.where(valid, encoded[..., TYPE], 0)]
+    covers = valid[..., None] & (ticks >= start[..., None]) & (ticks < end[..., None])
+
+    day_busy = occupancy(day, num_days, covers, valid)
+    busy = day_busy.any(axis=-1)
+    first = day_busy.argmax(axis=-1)
+    last = num_ticks - 1 - day_busy[..., ::-1].argmax(axis=-1)
+    within = busy[..., None] & (ticks >= first[..., None]) & (ticks <= last[..., None])
+    idle_ticks = (within & ~day_busy & ~break_mask).sum(axis=(1, 2))
+    daily_load = day_busy.sum(axis=-1) * hours_per_tick
+
+    num_professors = max(len(vocab["professor"]), 1)
+    professor_day = encoded[..., PROFESSOR] * num_days + day
+    professor_busy = occupancy(professor_day, num_professors * num_days, covers, valid)
+    consecutive_ticks = longest_runs(professor_busy).max(axis=-1, initial=0)
+
+    num_courses = max(len(vocab["course"]), 1)
+    lectures = valid & (encoded[..., TYPE] == SESSION_TYPES.index("Lecture"))
+    course_day = encoded[..., COURSE] * num_days + day
+    lecture_counts = (lectures[..., None] & (course_day[..., None] == np.arange(num_courses * num_days))).sum(axis=1)
+    lecture_repeats = np.maximum(lecture_counts - 1, 0).sum(axis=-1)
+
+    return {
+        "sessions": valid.sum(axis=-1),
+        "idle_gap_hours": idle_ticks * hours_per_tick,
+        "load_stddev": daily_load.std(axis=-1),
+        "max_consecutive_hours": consecutive_ticks * hours_per_tick,
+        "lecture_day_repeats": lecture_repeats
+    }
+
+def score_timetables(timetables: List[Timetable], courses: List[Course], generator, weights: Dict[str, float] = None) -> pd.DataFrame:
+    weights = weights or DEFAULT_WEIGHTS
+    encoded, vocab = encode_timetables(timetables, courses, generator)
+    metrics = score_encoded(encoded, vocab, generator)
+    table = pd.DataFrame(metrics)
+    table.insert(0, "candidate", np.arange(len(timetables)))
+    table["unplaced"] = count_unplaced(encoded, courses, len(vocab["course"]))
+    table["score"] = sum(table[name] * weight for name, weight in weights.items())
+    return table.sort_values(["unplaced", "score"], kind="stable").reset_index(drop=True)
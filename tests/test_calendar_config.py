@@ -0,0 +1,33 @@
+import pytest
+from calendar_config import TEMPLATE_CACHE_SIZE, CalendarConfig, compile_template
+
+def test_missing_session_duration_is_rejected():
+    default = CalendarConfig.default()
+    with pytest.raises(ValueError, match="Tutorial"):
+        CalendarConfig(default.working_days, default.working_hours, default.breaks, default.snack_slot,
+                       {"Lecture": 90, "Lab": 120}, default.step_minutes)
+
+def test_break_outside_working_hours_is_rejected():
+    with pytest.raises(ValueError, match="Lunch"):
+        CalendarConfig.from_dict({"breaks": [{"name": "Lunch", "start": "18:00", "end": "19:00"}]})
+
+def test_templates_are_shared_and_cache_is_bounded():
+    assert CalendarConfig.default().compile() is CalendarConfig.default().compile()
+    for step in range(5, 5 + 2 * TEMPLATE_CACHE_SIZE):
+        CalendarConfig.from_dict({"step_minutes": step}).compile()
+    assert compile_template.cache_info().currsize <= TEMPLATE_CACHE_SIZE
+
+def test_sessions_per_week_follows_calendar_durations():
+    default = CalendarConfig.default()
+    assert [default.sessions_per_week(t, h) for t, h in [("Lecture", 3), ("Tutorial", 1), ("Lab", 2)]] == [2, 1, 1]
+    short_lectures = CalendarConfig.from_dict({"durations_minutes": {"Lecture": 55, "Lab": 120, "Tutorial": 60}})
+    assert short_lectures.sessions_per_week("Lecture", 3) == 3
+
+def test_partial_nested_overrides_merge_with_defaults():
+    calendar = CalendarConfig.from_dict({"working_hours": {"start": "08:00"}, "durations_minutes": {"Lecture": 55}})
+    assert calendar.working_hours[1] == CalendarConfig.default().working_hours[1]
+    assert calendar.durations_minutes == {"Lecture": 55, "Lab": 120, "Tutorial": 60}
+
+def test_break_missing_field_is_rejected():
+    with pytest.raises(ValueError, match="end"):
+        CalendarConfig.from_dict({"breaks": [{"name": "Lunch", "start": "13:00"}]})
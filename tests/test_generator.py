@@ -0,0 +1,100 @@
+import datetime
+import time
+import pytest
+from models import Course, Room, Session, TimeSlot, Timetable
+from generator import GenerationRun, TimetableGenerator
+
+def overloaded_courses():
+    return [Course(f"C{i}", f"Course {i}", f"P{i}", 60, 3, 0, 1, "C1") for i in range(8)]
+
+def canonical(records):
+    return sorted(tuple(sorted(record.items())) for record in records)
+
+def test_overloaded_input_returns_best_snapshot_when_budget_runs_out(capsys):
+    courses = overloaded_courses()
+    generator = TimetableGenerator(max_backtrack_attempts=10 ** 9)
+    run = GenerationRun(seed=42, time_budget_ms=50)
+    started = time.monotonic()
+    timetable = generator.search(run, courses, [Room("C1", "Classroom", 60)])
+    assert time.monotonic() - started < 1.0
+    assert "Time budget exhausted" in capsys.readouterr().out
+    assert timetable.unplaced
+    assert timetable.sessions == run.best_sessions
+    assert (-len(timetable.sessions), timetable.penalty()) == run.best_score
+    assert len(timetable.sessions) + len(timetable.unplaced) == sum(c.total_sessions() for c in courses)
+
+def test_overloaded_input_stops_at_backtrack_cap_without_budget():
+    courses = overloaded_courses()
+    timetable = TimetableGenerator().generate_timetable(courses, [Room("C1", "Classroom", 60)], seed=42)
+    assert timetable.unplaced
+
+def test_same_seed_is_reproducible_on_shared_generator():
+    generator = TimetableGenerator()
+    courses = overloaded_courses()[:3]
+    rooms = [Room("C1", "Classroom", 60)]
+    first = generator.generate_timetable(courses, rooms, seed=7).to_records()
+    second = generator.generate_timetable(courses, rooms, seed=7).to_records()
+    assert first == second
+
+def test_ordering_does_not_exclude_late_week_days():
+    generator = TimetableGenerator()
+    room = Room("C1", "Classroom", 60)
+    busy_course = Course("B1", "Busy", "P", 60, 0, 0, 0)
+    course = Course("A1", "Late Week", "P", 60, 3, 0, 0, "C1")
+    timetable = Timetable()
+    for i, day in enumerate(["MON", "TUE"]):
+        busy_slot = TimeSlot(day, datetime.time(9, 0), datetime.time(17, 0))
+        timetable.add_session(Session(busy_course, "Lecture", Room("X1", "Classroom", 60), busy_slot, i))
+    run = GenerationRun(seed=1)
+    slots = generator.generate_time_slots()
+    for _ in range(3):
+        assert generator.assign_session(run, course, "Lecture", slots, [room], timetable)
+    lectures = [s for s in timetable.sessions if s.course is course]
+    positions = [generator.slot_position(s.time_slot) for s in lectures]
+    assert positions == sorted(positions)
+    assert {s.time_slot.day for s in lectures} <= {"WED", "THU", "FRI"}
+
+def test_malformed_hint_is_rejected():
+    generator = TimetableGenerator()
+    with pytest.raises(ValueError):
+        generator.index_hint({"sessions": []})
+    with pytest.raises(ValueError):
+        generator.index_hint([{"course_id": "A1", "session_type": "Lecture", "day": "MON", "start": "09:00", "end": "10:30"}])
+
+def test_hint_reproduces_previous_timetable():
+    generator = TimetableGenerator()
+    courses = overloaded_courses()[:3]
+    rooms = [Room("C1", "Classroom", 60)]
+    previous = generator.generate_timetable(courses, rooms, seed=1).to_records()
+    fresh = generator.generate_timetable(courses, rooms, seed=2).to_records()
+    warm = generator.generate_timetable(courses, rooms, seed=2, hint=previous).to_records()
+    assert canonical(fresh) != canonical(previous)
+    assert canonical(warm) == canonical(previous)
+
+def test_hint_falls_back_when_hinted_room_is_gone():
+    generator = TimetableGenerator()
+    course = Course("A1", "Roomless", "P", 60, 2, 0, 1)
+    previous = generator.generate_timetable([course], [Room("OLD", "Classroom", 60)], seed=1).to_records()
+    warm = generator.generate_timetable([course], [Room("NEW", "Classroom", 60)], seed=2, hint=previous).to_records()
+    assert {r["room_id"] for r in warm} == {"NEW"}
+    assert sorted((r["day"], r["start"], r["end"]) for r in warm) == sorted((r["day"], r["start"], r["end"]) for r in previous)
+
+def test_get_available_rooms_keeps_every_free_equivalent_room():
+    generator = TimetableGenerator()
+    rooms = [Room("C1", "Classroom", 60), Room("C2", "Classroom", 60), Room("L1", "LabRoom", 40)]
+    course = Course("A1", "Any Room", "P", 60, 1, 0, 0)
+    slot = generator.filter_time_slots(generator.generate_time_slots(), "Lecture")[0]
+    timetable = Timetable()
+    assert generator.get_available_rooms(rooms, course, "Lecture", slot, timetable) == rooms
+    timetable.add_session(Session(Course("B1", "Other", "Q", 60, 1, 0, 0), "Lecture", rooms[0], slot, 0))
+    assert generator.get_available_rooms(rooms, course, "Lecture", slot, timetable) == rooms[1:]
+
+def test_interchangeable_sessions_are_placed_in_week_order():
+    generator = TimetableGenerator()
+    courses = overloaded_courses()[:3]
+    timetable = generator.generate_timetable(courses, [Room("C1", "Classroom", 60)], seed=5)
+    for course in courses:
+        lectures = [s for s in timetable.sessions if s.course is course and s.session_type == "Lecture"]
+        positions = [generator.slot_position(s.time_slot) for s in lectures]
+        assert len(positions) == 3
+        assert positions == sorted(positions)
@@ -0,0 +1,41 @@
+import datetime
+import numpy as np
+import pytest
+from models import Course, Room, Session, TimeSlot, Timetable
+from generator import TimetableGenerator
+from scoring import encode_timetables, score_encoded, score_timetables
+
+def test_incomplete_candidates_rank_after_complete_ones():
+    generator = TimetableGenerator()
+    courses = [Course(f"C{i}", f"Course {i}", f"P{i}", 60, 2, 0, 1, "C1") for i in range(3)]
+    full = generator.generate_timetable(courses, [Room("C1", "Classroom", 60)], seed=3)
+    partial = Timetable()
+    for session in full.sessions[:4]:
+        partial.add_session(session)
+    table = score_timetables([Timetable(), partial, full], courses, generator)
+    assert list(table["candidate"]) == [2, 1, 0]
+    assert list(table["unplaced"]) == [0, 5, 9]
+
+def test_metrics_on_hand_built_timetable():
+    generator = TimetableGenerator()
+    room = Room("C1", "Classroom", 60)
+    course_a = Course("A1", "A", "P", 60, 2, 0, 0)
+    course_b = Course("B1", "B", "Q", 60, 1, 0, 1)
+    course_c = Course("C1", "C", "P", 60, 0, 0, 1)
+    timetable = Timetable()
+    for i, (course, session_type, day, start, end) in enumerate([
+        (course_a, "Lecture", "MON", (9, 0), (10, 30)),
+        (course_a, "Lecture", "MON", (11, 0), (12, 30)),
+        (course_c, "Tutorial", "MON", (12, 30), (13, 30)),
+        (course_b, "Lecture", "TUE", (9, 0), (10, 30)),
+        (course_b, "Tutorial", "TUE", (11, 30), (12, 30)),
+    ]):
+        slot = TimeSlot(day, datetime.time(*start), datetime.time(*end))
+        timetable.add_session(Session(course, session_type, room, slot, i))
+    encoded, vocab = encode_timetables([timetable], [course_a, course_b, course_c], generator)
+    metrics = score_encoded(encoded, vocab, generator)
+    assert metrics["sessions"][0] == 5
+    assert metrics["idle_gap_hours"][0] == 0.5
+    assert metrics["load_stddev"][0] == pytest.approx(np.std([4.0, 2.5, 0, 0, 0]))
+    assert metrics["max_consecutive_hours"][0] == 2.5
+    assert metrics["lecture_day_repeats"][0] == 1